@@ -3,58 +3,174 @@ import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from scipy.stats import norm
+import plotly.io as pio
+from scipy.special import ndtr
 import math
 
-# Black-Scholes pricing functions
-def black_scholes_call(S, K, T, r, sigma):
-    """Calculate Black-Scholes call option price"""
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    call_price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    return call_price
+try:
+    # Kernels live in their own module so Numba's cache never points back at this script
+    import bs_kernels
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-def black_scholes_put(S, K, T, r, sigma):
-    """Calculate Black-Scholes put option price"""
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    put_price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    return put_price
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
 
-def calculate_greeks(S, K, T, r, sigma, option_type='call'):
-    """Calculate option Greeks"""
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    # Delta
-    if option_type == 'call':
-        delta = norm.cdf(d1)
-    else:
-        delta = norm.cdf(d1) - 1
-    
-    # Gamma
-    gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    
-    # Theta
-    if option_type == 'call':
-        theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) 
-                - r * K * np.exp(-r * T) * norm.cdf(d2)) / 365
-    else:
-        theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T)) 
-                + r * K * np.exp(-r * T) * norm.cdf(-d2)) / 365
-    
-    # Vega
-    vega = S * norm.pdf(d1) * np.sqrt(T) / 100
+def _stdnorm_pdf(x):
+    """Standard normal density as a plain exp ufunc (scalar or array)"""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+# Black-Scholes pricing functions
+def make_bs_pricer(K, T, r, option_type='call'):
+    """Build a price(S, sigma) function with the K, T, r invariants precomputed"""
+    rT = r * T
+    K_disc = K * math.exp(-rT)
+    sqrtT = math.sqrt(T)
+    
+    def price(S, sigma):
+        vol_sqrtT = sigma * sqrtT
+        d1 = (np.log(S / K) + rT + 0.5 * vol_sqrtT * vol_sqrtT) / vol_sqrtT
+        d2 = d1 - vol_sqrtT
+        if option_type == 'call':
+            return S * ndtr(d1) - K_disc * ndtr(d2)
+        return K_disc * ndtr(-d2) - S * ndtr(-d1)
+    
+    return price
+
+@st.cache_data(max_entries=1024)
+def bs_price_and_greeks(S, K, T, r, sigma, option_type='call'):
+    """Calculate option price and Greeks from a single set of shared terms"""
+    sqrtT = np.sqrt(T)
+    vol_sqrtT = sigma * sqrtT
+    rT = r * T
+    d1 = (np.log(S / K) + rT + 0.5 * vol_sqrtT * vol_sqrtT) / vol_sqrtT
+    d2 = d1 - vol_sqrtT
+    pdf_d1 = _stdnorm_pdf(d1)
+    S_pdf_d1 = S * pdf_d1
+    K_disc = K * np.exp(-rT)
     
-    # Rho
     if option_type == 'call':
-        rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100
+        cdf_d1 = ndtr(d1)
+        K_disc_cdf_d2 = K_disc * ndtr(d2)
+        price = S * cdf_d1 - K_disc_cdf_d2
+        delta = cdf_d1
+        theta_carry = -r * K_disc_cdf_d2
+        rho = T * K_disc_cdf_d2 / 100
     else:
-        rho = -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
-    
-    return {'delta': delta, 'gamma': gamma, 'theta': theta, 'vega': vega, 'rho': rho}
+        cdf_d1 = ndtr(-d1)
+        K_disc_cdf_d2 = K_disc * ndtr(-d2)
+        price = K_disc_cdf_d2 - S * cdf_d1
+        delta = -cdf_d1
+        theta_carry = r * K_disc_cdf_d2
+        rho = -T * K_disc_cdf_d2 / 100
+    
+    # Theta and vega share S * pdf(d1); vega is nearly free once it exists
+    gamma = pdf_d1 / (S * vol_sqrtT)
+    theta = (-S_pdf_d1 * sigma / (2 * sqrtT) + theta_carry) / 365
+    vega = S_pdf_d1 * sqrtT / 100
+    
+    greeks = {'delta': delta, 'gamma': gamma, 'theta': theta, 'vega': vega, 'rho': rho}
+    return price, greeks
+
+def black_scholes_grid(spot_prices, volatilities, K, T, r, option_type='call'):
+    """Calculate option prices over a (volatility, spot) grid in one broadcasted pass"""
+    price = make_bs_pricer(K, T, r, option_type)
+    return price(spot_prices[None, :], volatilities[:, None])
+
+def price_and_pnl_grid(spot_prices, volatilities, K, T, r, option_type, option_price, position):
+    """Calculate price and P&L matrices, using the Numba kernel when available"""
+    sign = 1.0 if position == "Long" else -1.0
+    # Contiguous float64 axes keep ufuncs on their fast path and match the warmed-up kernel
+    spot_prices = np.ascontiguousarray(spot_prices, dtype=np.float64)
+    volatilities = np.ascontiguousarray(volatilities, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return bs_kernels.bs_pnl_grid(spot_prices, volatilities, K, T, r,
+                                      option_type == 'call', float(option_price), sign)
+
+    price_matrix = black_scholes_grid(spot_prices, volatilities, K, T, r, option_type)
+    pnl_matrix = np.subtract(price_matrix, option_price)
+    pnl_matrix *= sign
+    return price_matrix, pnl_matrix
+
+def pnl_stats(pnl_matrix):
+    """Return (max, min, profitable cell count, mean, std) of the P&L matrix"""
+    flat = np.ascontiguousarray(pnl_matrix, dtype=np.float64).ravel()
+    if NUMBA_AVAILABLE:
+        return bs_kernels.pnl_stats(flat)
+
+    pnl_mean = flat.mean()
+    dev = flat - pnl_mean
+    dev *= dev
+    return flat.max(), flat.min(), np.count_nonzero(flat > 0), pnl_mean, math.sqrt(dev.mean())
+
+@st.cache_data(max_entries=128)
+def heatmap_grid(S, K, T, r, sigma, option_price, spot_range, vol_range, grid_size,
+                 option_type, position):
+    """Build the heatmap axes and price/P&L matrices for the given inputs"""
+    spot_min = S * (1 + spot_range[0] / 100)
+    spot_max = S * (1 + spot_range[1] / 100)
+    vol_min = max(0.01, sigma * (1 + vol_range[0] / 100))  # Ensure vol doesn't go negative
+    vol_max = sigma * (1 + vol_range[1] / 100)
+
+    spot_prices = np.linspace(spot_min, spot_max, grid_size)
+    volatilities = np.linspace(vol_min, vol_max, grid_size)
+
+    price_matrix, pnl_matrix = price_and_pnl_grid(spot_prices, volatilities, K, T, r,
+                                                  option_type, option_price, position)
+
+    # Cosmetic: when the grid happens to hit the current (S, sigma) exactly, show that cell
+    # at the known price so the fastmath kernel's last-ulp rounding doesn't count a zero
+    # P&L as profitable. Off-grid inputs are unaffected; this is not a precision fix.
+    vol_idx = np.flatnonzero(np.isclose(volatilities, sigma, rtol=1e-12, atol=0.0))
+    spot_idx = np.flatnonzero(np.isclose(spot_prices, S, rtol=1e-12, atol=0.0))
+    if vol_idx.size and spot_idx.size:
+        price_matrix[vol_idx[0], spot_idx[0]] = option_price
+        pnl_matrix[vol_idx[0], spot_idx[0]] = 0.0
+    return spot_prices, volatilities, price_matrix, pnl_matrix
+
+@st.cache_data(max_entries=128)
+def _price_vs_spot(S, K, T, r, sigma, option_type):
+    """Option price curve over +/-30% of the current stock price"""
+    spots = np.linspace(S * 0.7, S * 1.3, 100)
+    return spots, make_bs_pricer(K, T, r, option_type)(spots, sigma)
+
+@st.cache_data(max_entries=128)
+def _price_vs_vol(S, K, T, r, option_type):
+    """Option price curve over volatilities from 5% to 100%"""
+    vols = np.linspace(0.05, 1.0, 100)
+    return vols, make_bs_pricer(K, T, r, option_type)(S, vols)
+
+# Static heatmap styling, registered once per process since Streamlit reruns the script.
+# Only the overrides live here; they are layered on the "streamlit" theme template so the
+# figure keeps following the active Streamlit theme (e.g. dark mode)
+if "bs_heatmap" not in pio.templates:
+    bs_heatmap_template = go.layout.Template()
+    bs_heatmap_template.layout.update(
+        title=dict(x=0.5, font=dict(size=16)),
+        xaxis=dict(
+            title="Stock Price ($)",
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(128,128,128,0.2)'
+        ),
+        yaxis=dict(
+            title="Volatility (%)",
+            showgrid=True,
+            gridwidth=1,
+            gridcolor='rgba(128,128,128,0.2)'
+        ),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(size=12),
+        showlegend=True,
+        legend=dict(
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=1.02
+        )
+    )
+    pio.templates["bs_heatmap"] = bs_heatmap_template
 
 # Streamlit app
 st.set_page_config(page_title="Black-Scholes Options Pricer", layout="wide")
@@ -72,28 +188,12 @@ sigma = st.sidebar.number_input("Volatility (%)", value=20.0, min_value=0.1, max
 option_type = st.sidebar.selectbox("Option Type", ["call", "put"])
 
 # Calculate option price and Greeks
-if option_type == "call":
-    option_price = black_scholes_call(S, K, T, r, sigma)
-else:
-    option_price = black_scholes_put(S, K, T, r, sigma)
-
-greeks = calculate_greeks(S, K, T, r, sigma, option_type)
+option_price, greeks = bs_price_and_greeks(S, K, T, r, sigma, option_type)
 
-# Main layout
-col1, col2 = st.columns([1, 2])
-
-with col1:
-    st.header("Option Pricing")
-    st.metric("Option Price", f"${option_price:.4f}")
-    
-    st.subheader("Greeks")
-    st.metric("Delta", f"{greeks['delta']:.4f}")
-    st.metric("Gamma", f"{greeks['gamma']:.4f}")
-    st.metric("Theta", f"{greeks['theta']:.4f}")
-    st.metric("Vega", f"{greeks['vega']:.4f}")
-    st.metric("Rho", f"{greeks['rho']:.4f}")
-
-with col2:
+# Heatmap section; runs as a fragment so heatmap-only widgets rerun just this block
+@st.fragment
+def render_heatmap(S, K, T, r, sigma, option_type, option_price):
+    """Render the P&L heatmap with its settings and summary statistics"""
     st.header("Enhanced P&L Heatmap")
     
     # Heatmap parameters
@@ -116,35 +216,11 @@ with col2:
         show_breakeven = st.checkbox("Show Breakeven Line", value=True)
         show_moneyness = st.checkbox("Show Moneyness Lines", value=True)
     
-    # Create heatmap data
-    spot_min = S * (1 + spot_range[0] / 100)
-    spot_max = S * (1 + spot_range[1] / 100)
-    vol_min = max(0.01, sigma * (1 + vol_range[0] / 100))  # Ensure vol doesn't go negative
-    vol_max = sigma * (1 + vol_range[1] / 100)
-    
-    spot_prices = np.linspace(spot_min, spot_max, grid_size)
-    volatilities = np.linspace(vol_min, vol_max, grid_size)
-    
-    # Calculate matrices
-    pnl_matrix = np.zeros((len(volatilities), len(spot_prices)))
-    price_matrix = np.zeros((len(volatilities), len(spot_prices)))
-    
-    for i, vol in enumerate(volatilities):
-        for j, spot in enumerate(spot_prices):
-            if option_type == "call":
-                new_price = black_scholes_call(spot, K, T, r, vol)
-            else:
-                new_price = black_scholes_put(spot, K, T, r, vol)
-            
-            price_matrix[i, j] = new_price
-            
-            if position == "Long":
-                pnl = new_price - option_price
-            else:
-                pnl = option_price - new_price
-            
-            pnl_matrix[i, j] = pnl
-    
+    # Create heatmap data (cached, so display-only toggles reuse the matrices)
+    spot_prices, volatilities, price_matrix, pnl_matrix = heatmap_grid(
+        S, K, T, r, sigma, option_price, tuple(spot_range), tuple(vol_range), grid_size,
+        option_type, position)
+
     # Select data based on heatmap type
     if heatmap_type == "P&L":
         z_data = pnl_matrix
@@ -155,20 +231,32 @@ with col2:
         colorbar_title = "Option Price ($)"
         zmid = None
     else:  # % P&L
-        z_data = (pnl_matrix / option_price) * 100
+        z_data = pnl_matrix * (100 / option_price)
         colorbar_title = "P&L (%)"
         zmid = 0
     
+    # Plot resolution doesn't need float64; Plotly >= 6 ships numpy arrays as typed
+    # base64 buffers, so float32 halves the payload sent to the browser
+    z32 = np.ascontiguousarray(z_data, dtype=np.float32)
+    x32 = spot_prices.astype(np.float32)
+    y32 = (volatilities * 100).astype(np.float32)
+    
     # Create enhanced heatmap
     fig = go.Figure()
     
-    # Add heatmap
-    heatmap = go.Heatmap(
-        z=z_data,
-        x=spot_prices,
-        y=volatilities * 100,
+    # Add heatmap; one Contour trace renders both the fill and the optional lines
+    heatmap = go.Contour(
+        z=z32,
+        x=x32,
+        y=y32,
         colorscale=colorscale,
         zmid=zmid,
+        contours=dict(
+            coloring='heatmap',
+            showlabels=show_contours,
+            labelfont=dict(size=10, color='white')
+        ),
+        line=dict(width=1 if show_contours else 0, color='white'),
         colorbar=dict(
             title=colorbar_title,
             thickness=15,
@@ -183,45 +271,20 @@ with col2:
     
     fig.add_trace(heatmap)
     
-    # Add contour lines if selected
-    if show_contours:
-        contour = go.Contour(
-            z=z_data,
-            x=spot_prices,
-            y=volatilities * 100,
-            showscale=False,
-            contours=dict(
-                coloring='lines',
-                showlabels=True,
-                labelfont=dict(size=10, color='white')
-            ),
-            line=dict(width=1, color='white'),
-            opacity=0.6,
-            hoverinfo='skip'
-        )
-        fig.add_trace(contour)
-    
     # Add breakeven line if selected and P&L heatmap
     if show_breakeven and heatmap_type in ["P&L", "% P&L"]:
-        # Find breakeven points (where P&L ≈ 0)
-        breakeven_spots = []
-        breakeven_vols = []
-        
-        for i, vol in enumerate(volatilities):
-            for j, spot in enumerate(spot_prices):
-                if abs(pnl_matrix[i, j]) < 0.01:  # Close to breakeven
-                    breakeven_spots.append(spot)
-                    breakeven_vols.append(vol * 100)
-        
-        if breakeven_spots:
-            fig.add_scatter(
-                x=breakeven_spots,
-                y=breakeven_vols,
-                mode='markers',
-                marker=dict(size=3, color='yellow', symbol='circle'),
-                name='Breakeven Points',
-                hovertemplate='<b>Breakeven</b><br>Price: $%{x:.2f}<br>Vol: %{y:.1f}%<extra></extra>'
-            )
+        # Let Plotly trace the P&L = 0 level set instead of scanning cells
+        fig.add_trace(go.Contour(
+            z=z32 if heatmap_type == "P&L" else np.ascontiguousarray(pnl_matrix, dtype=np.float32),
+            x=x32,
+            y=y32,
+            contours=dict(type='constraint', operation='=', value=0, showlabels=False),
+            line=dict(color='yellow', width=2),
+            showscale=False,
+            name='Breakeven',
+            showlegend=True,
+            hoverinfo='skip'
+        ))
     
     # Add moneyness lines if selected
     if show_moneyness:
@@ -251,51 +314,25 @@ with col2:
         hovertemplate='<b>Current Position</b><br>Price: $%{x:.2f}<br>Vol: %{y:.1f}%<extra></extra>'
     )
     
-    # Enhanced layout
+    # Enhanced layout; static styling comes from the bs_heatmap template
     fig.update_layout(
-        title=dict(
-            text=f"{position} {option_type.title()} Option {heatmap_type} Heatmap",
-            x=0.5,
-            font=dict(size=16)
-        ),
-        xaxis=dict(
-            title="Stock Price ($)",
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        ),
-        yaxis=dict(
-            title="Volatility (%)",
-            showgrid=True,
-            gridwidth=1,
-            gridcolor='rgba(128,128,128,0.2)'
-        ),
-        height=600,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(size=12),
-        showlegend=True,
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=1.02
-        )
+        template="streamlit+bs_heatmap",
+        title_text=f"{position} {option_type.title()} Option {heatmap_type} Heatmap",
+        height=600
     )
     
     st.plotly_chart(fig, use_container_width=True)
     
     # Add summary statistics
+    max_profit, max_loss, n_profitable, pnl_mean, pnl_std = pnl_stats(pnl_matrix)
     col2d, col2e, col2f = st.columns(3)
     
     with col2d:
-        max_profit = np.max(pnl_matrix)
-        max_loss = np.min(pnl_matrix)
         st.metric("Max Profit", f"${max_profit:.2f}")
         st.metric("Max Loss", f"${max_loss:.2f}")
     
     with col2e:
-        profit_prob = np.sum(pnl_matrix > 0) / pnl_matrix.size * 100
+        profit_prob = n_profitable / pnl_matrix.size * 100
         st.metric("Profit Probability", f"{profit_prob:.1f}%")
         
         current_pnl = 0  # Current position P&L is 0
@@ -303,8 +340,6 @@ with col2:
     
     with col2f:
         # Risk metrics
-        pnl_std = np.std(pnl_matrix)
-        pnl_mean = np.mean(pnl_matrix)
         if pnl_std > 0:
             sharpe_approx = pnl_mean / pnl_std
         else:
@@ -313,6 +348,24 @@ with col2:
         st.metric("P&L Std Dev", f"${pnl_std:.2f}")
         st.metric("Risk-Reward Ratio", f"{sharpe_approx:.2f}")
 
+
+# Main layout
+col1, col2 = st.columns([1, 2])
+
+with col1:
+    st.header("Option Pricing")
+    st.metric("Option Price", f"${option_price:.4f}")
+    
+    st.subheader("Greeks")
+    st.metric("Delta", f"{greeks['delta']:.4f}")
+    st.metric("Gamma", f"{greeks['gamma']:.4f}")
+    st.metric("Theta", f"{greeks['theta']:.4f}")
+    st.metric("Vega", f"{greeks['vega']:.4f}")
+    st.metric("Rho", f"{greeks['rho']:.4f}")
+
+with col2:
+    render_heatmap(S, K, T, r, sigma, option_type, option_price)
+
 # Additional analysis
 st.header("Sensitivity Analysis")
 
@@ -320,12 +373,7 @@ col3, col4 = st.columns(2)
 
 with col3:
     st.subheader("Price vs Stock Price")
-    spot_range_analysis = np.linspace(S * 0.7, S * 1.3, 100)
-    
-    if option_type == "call":
-        prices = [black_scholes_call(spot, K, T, r, sigma) for spot in spot_range_analysis]
-    else:
-        prices = [black_scholes_put(spot, K, T, r, sigma) for spot in spot_range_analysis]
+    spot_range_analysis, prices = _price_vs_spot(S, K, T, r, sigma, option_type)
     
     fig_price = go.Figure()
     fig_price.add_trace(go.Scatter(x=spot_range_analysis, y=prices, mode='lines', name='Option Price'))
@@ -335,12 +383,7 @@ with col3:
 
 with col4:
     st.subheader("Price vs Volatility")
-    vol_range_analysis = np.linspace(0.05, 1.0, 100)
-    
-    if option_type == "call":
-        vol_prices = [black_scholes_call(S, K, T, r, vol) for vol in vol_range_analysis]
-    else:
-        vol_prices = [black_scholes_put(S, K, T, r, vol) for vol in vol_range_analysis]
+    vol_range_analysis, vol_prices = _price_vs_vol(S, K, T, r, option_type)
     
     fig_vol = go.Figure()
     fig_vol.add_trace(go.Scatter(x=vol_range_analysis * 100, y=vol_prices, mode='lines', name='Option Price'))
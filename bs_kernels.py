@@ -0,0 +1,69 @@
+"""Numba kernels for the Streamlit app's heatmap grid.
+
+Kept out of app.py because Numba's on-disk cache records the defining module and
+re-imports it when loading; importing the Streamlit script would rerun the whole page.
+"""
+import math
+
+import numpy as np
+from numba import njit
+
+
+@njit(fastmath=True, cache=True)
+def bs_pnl_grid(spots, vols, K, T, r, is_call, base_price=0.0, sign=1.0):
+    """Fused price and P&L grid kernel, one pass over the (volatility, spot) grid"""
+    n_vols = vols.shape[0]
+    n_spots = spots.shape[0]
+    price_matrix = np.empty((n_vols, n_spots))
+    pnl_matrix = np.empty((n_vols, n_spots))
+
+    sqrtT = math.sqrt(T)
+    discount = math.exp(-r * T)
+    inv_sqrt2 = 1.0 / math.sqrt(2.0)
+
+    for i in range(n_vols):
+        vol_sqrtT = vols[i] * sqrtT
+        drift = (r + 0.5 * vols[i] * vols[i]) * T
+        for j in range(n_spots):
+            d1 = (math.log(spots[j] / K) + drift) / vol_sqrtT
+            d2 = d1 - vol_sqrtT
+            if is_call:
+                price = (spots[j] * 0.5 * math.erfc(-d1 * inv_sqrt2)
+                         - K * discount * 0.5 * math.erfc(-d2 * inv_sqrt2))
+            else:
+                price = (K * discount * 0.5 * math.erfc(d2 * inv_sqrt2)
+                         - spots[j] * 0.5 * math.erfc(d1 * inv_sqrt2))
+            price_matrix[i, j] = price
+            pnl_matrix[i, j] = sign * (price - base_price)
+
+    return price_matrix, pnl_matrix
+
+
+@njit(fastmath=True, cache=True)
+def pnl_stats(pnl):
+    """Max, min, positive count, mean and std of a flat P&L array in one pass"""
+    shift = pnl[0]  # Accumulate around the first value to limit cancellation
+    mx = pnl[0]
+    mn = pnl[0]
+    n_pos = 0
+    total = 0.0
+    total_sq = 0.0
+    for k in range(pnl.shape[0]):
+        x = pnl[k]
+        mx = max(mx, x)
+        mn = min(mn, x)
+        if x > 0:
+            n_pos += 1
+        dx = x - shift
+        total += dx
+        total_sq += dx * dx
+    n = pnl.shape[0]
+    mean_dx = total / n
+    var = max(total_sq / n - mean_dx * mean_dx, 0.0)
+    return mx, mn, n_pos, shift + mean_dx, math.sqrt(var)
+
+
+# Load from Numba's on-disk cache (or compile) at import rather than on the first heatmap.
+# Python caches the import, so this runs once per process, not on every Streamlit rerun.
+bs_pnl_grid(np.array([100.0]), np.array([0.2]), 100.0, 0.25, 0.05, True, 0.0, 1.0)
+pnl_stats(np.array([0.0]))
@@ -0,0 +1,114 @@
+"""Cross-check the Streamlit app's pricing paths against a plain scipy.stats reference"""
+import importlib
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+K, T, R = 100.0, 0.25, 0.05
+SPOTS = np.linspace(70.0, 130.0, 13)
+VOLS = np.linspace(0.05, 0.8, 11)
+RTOL = 1e-10
+
+
+@pytest.fixture(scope="module")
+def app():
+    """Import app.py once; outside `streamlit run` its UI calls are no-ops"""
+    return importlib.import_module("app")
+
+
+def ref_price(S, sigma, option_type):
+    d1 = (np.log(S / K) + (R + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    if option_type == 'call':
+        return S * norm.cdf(d1) - K * np.exp(-R * T) * norm.cdf(d2)
+    return K * np.exp(-R * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+
+def ref_greeks(S, sigma, option_type):
+    d1 = (np.log(S / K) + (R + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    common_theta = -S * norm.pdf(d1) * sigma / (2 * np.sqrt(T))
+    if option_type == 'call':
+        delta = norm.cdf(d1)
+        theta = (common_theta - R * K * np.exp(-R * T) * norm.cdf(d2)) / 365
+        rho = K * T * np.exp(-R * T) * norm.cdf(d2) / 100
+    else:
+        delta = -norm.cdf(-d1)
+        theta = (common_theta + R * K * np.exp(-R * T) * norm.cdf(-d2)) / 365
+        rho = -K * T * np.exp(-R * T) * norm.cdf(-d2) / 100
+    return {
+        'delta': delta,
+        'gamma': norm.pdf(d1) / (S * sigma * np.sqrt(T)),
+        'theta': theta,
+        'vega': S * norm.pdf(d1) * np.sqrt(T) / 100,
+        'rho': rho,
+    }
+
+
+def ref_grid(option_type):
+    return ref_price(SPOTS[None, :], VOLS[:, None], option_type)
+
+
+def test_stdnorm_pdf_matches_norm_pdf(app):
+    x = np.linspace(-6.0, 6.0, 101)
+    np.testing.assert_allclose(app._stdnorm_pdf(x), norm.pdf(x), rtol=1e-14)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_make_bs_pricer_matches_reference(app, option_type):
+    price = app.make_bs_pricer(K, T, R, option_type)
+    np.testing.assert_allclose(price(SPOTS[None, :], VOLS[:, None]), ref_grid(option_type),
+                               rtol=RTOL, atol=1e-12)
+    assert math.isclose(price(105.0, 0.3), ref_price(105.0, 0.3, option_type),
+                        rel_tol=RTOL)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("S,sigma", [(80.0, 0.15), (100.0, 0.2), (125.0, 0.6)])
+def test_price_and_greeks_match_reference(app, option_type, S, sigma):
+    price, greeks = app.bs_price_and_greeks(S, K, T, R, sigma, option_type)
+    assert math.isclose(price, ref_price(S, sigma, option_type), rel_tol=RTOL)
+    for name, expected in ref_greeks(S, sigma, option_type).items():
+        assert math.isclose(greeks[name], expected, rel_tol=RTOL, abs_tol=1e-14), name
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_black_scholes_grid_matches_reference(app, option_type):
+    np.testing.assert_allclose(app.black_scholes_grid(SPOTS, VOLS, K, T, R, option_type),
+                               ref_grid(option_type), rtol=RTOL, atol=1e-12)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("use_numba", [False, True])
+@pytest.mark.parametrize("position,sign", [("Long", 1.0), ("Short", -1.0)])
+def test_price_and_pnl_grid_matches_reference(app, monkeypatch, option_type, use_numba,
+                                              position, sign):
+    if use_numba and not app.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(app, "NUMBA_AVAILABLE", use_numba)
+    base = ref_price(100.0, 0.2, option_type)
+    price_matrix, pnl_matrix = app.price_and_pnl_grid(SPOTS, VOLS, K, T, R, option_type,
+                                                      base, position)
+    expected = ref_grid(option_type)
+    np.testing.assert_allclose(price_matrix, expected, rtol=RTOL, atol=1e-12)
+    np.testing.assert_allclose(pnl_matrix, sign * (expected - base), rtol=RTOL, atol=1e-12)
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_pnl_stats_matches_numpy(app, monkeypatch, use_numba):
+    if use_numba and not app.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(app, "NUMBA_AVAILABLE", use_numba)
+    pnl = ref_grid('call') - ref_price(100.0, 0.2, 'call')
+    mx, mn, n_pos, mean, std = app.pnl_stats(pnl)
+    assert mx == pnl.max()
+    assert mn == pnl.min()
+    assert n_pos == np.count_nonzero(pnl > 0)
+    assert math.isclose(mean, pnl.mean(), rel_tol=1e-12)
+    assert math.isclose(std, pnl.std(), rel_tol=1e-10)